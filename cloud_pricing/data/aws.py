@@ -23,8 +23,12 @@ class AWSProcessor(FixedInstance):
         'capacitystatus', 'vcpu', 'memory', 'gpu'
     ]
 
-    def __init__(self, table_name='aws_data.pkl'):
-        super().__init__(table_name)
+    # Instances repeat for every OS, tenancy, etc. but each has its own SKU
+    key_cols = ['sku']
+    display_cols = ['operatingSystem', 'tenancy', 'capacitystatus']
+
+    def __init__(self, table_name='aws_data.pkl', refresh_stale=True):
+        super().__init__(table_name, refresh_stale)
 
     def filter(self, *args, **kwargs):
         if kwargs['spot']:
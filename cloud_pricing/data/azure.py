@@ -18,8 +18,8 @@ class AzureProcessor(FixedInstance):
         'GPU', 'Pay as you go', 'Spot(% Savings)'
     ]
 
-    def __init__(self, table_name='azure_data.pkl'):
-        super().__init__(table_name)
+    def __init__(self, table_name='azure_data.pkl', refresh_stale=True):
+        super().__init__(table_name, refresh_stale)
 
     def extract_table(self, table, region='us-east'):
         rows = table.find_all('tr')
@@ -1,6 +1,7 @@
 import pandas as pd
 
 from cloud_pricing import data
+from cloud_pricing.data.diff import diff_tables
 
 PROVIDERS = {
     'GCP': data.GCPProcessor,
@@ -10,20 +11,33 @@ PROVIDERS = {
 
 
 class CloudProcessor:
-    def __init__(self, providers="ALL"):
+    def __init__(self, providers="ALL", refresh_stale=True):
         self._tables = []
 
         if providers == 'ALL':
-            processors = list(PROVIDERS.values())
+            self._providers = list(PROVIDERS.keys())
         else:
-            processors = [PROVIDERS[p] for p in providers.split(',')]
+            self._providers = providers.split(',')
 
-        for t in processors:
-            self._tables.append(t())
+        for p in self._providers:
+            self._tables.append(PROVIDERS[p](refresh_stale=refresh_stale))
 
     def update(self):
-        for t in self._tables:
-            t.setup()
+        """Refresh every provider's table and return the price changes.
+        Use `refresh_stale=False` so that a stale table is compared instead
+        of being replaced when the processor is created.
+
+        A provider that fails to refresh is reported and skipped.
+        """
+        diffs = []
+        for p,t in zip(self._providers, self._tables):
+            old = t.table
+            try:
+                t.refresh()
+                diffs.append(diff_tables(old, t.table, p, t.key_cols, t.display_cols))
+            except Exception as e:
+                print(f"Failed to update {p}: {e}")
+        return pd.concat(diffs, sort=False, ignore_index=True) if diffs else pd.DataFrame()
 
     # TODO: Add prefix to all labels that are in only one of the processors (like aws-)
     # Clean up the args here
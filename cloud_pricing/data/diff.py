@@ -0,0 +1,91 @@
+"Compare two versions of a provider's price table."
+import pandas as pd
+
+KEY_COLS = ['Provider', 'Name', 'Region']
+SPEC_COLS = ['CPUs', 'RAM (GB)', 'GPUs', 'GPU Name', 'GPU RAM (GB)']
+PRICE_COLS = ['Price ($/hr)', 'Spot ($/hr)']
+
+
+def row_keys(df, provider, key_cols):
+    "Hash each row of `df` on its provider and `key_cols` into a uint64 key."
+    keys = pd.DataFrame({'Provider': [provider]*len(df)})
+    for c in key_cols:
+        keys[c] = df[c].astype(str).values if c in df.columns else ''
+    return pd.util.hash_pandas_object(keys, index=False).values
+
+
+def keyed_table(df, provider, key_cols):
+    """Index `df` by its row keys. Rows that are exact copies are dropped
+    and a `ValueError` is raised if the remaining rows repeat a key.
+    """
+    # AWS keeps the SKU in the index
+    df = df.reset_index(drop=df.index.name is None)
+    df = df[~df.astype(str).duplicated()]
+    df = df.assign(_key=row_keys(df, provider, key_cols))
+
+    repeated = df['_key'].duplicated(keep=False)
+    if repeated.any():
+        examples = df.loc[repeated].filter(key_cols).drop_duplicates()[:5]
+        raise ValueError(f"{provider} rows are not unique on {key_cols}, e.g.:\n{examples}")
+
+    df.insert(0, 'Provider', provider)
+    return df.set_index('_key')
+
+
+def diff_tables(old, new, provider, key_cols=('Name', 'Region'), display_cols=()):
+    """Find the instances that were added, removed or repriced between the
+    `old` and `new` tables of a provider. Rows are matched through hashes of
+    `key_cols`, which must identify a row uniquely, so the comparison is
+    linear in the size of the tables. `display_cols` are carried into the
+    output to tell apart rows of the same instance.
+
+    Returns a DataFrame with a `Change` column of 'added', 'removed' or
+    'repriced', the instance specs and the old and new prices.
+    """
+    key_cols = list(key_cols)
+    old, new = keyed_table(old, provider, key_cols), keyed_table(new, provider, key_cols)
+    prices = [c for c in PRICE_COLS if c in old.columns or c in new.columns]
+
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    common = new.index.intersection(old.index)
+
+    repriced = pd.Series(False, index=common)
+    for c in prices:
+        o = old[c].reindex(common) if c in old.columns else pd.Series(float('nan'), index=common)
+        n = new[c].reindex(common) if c in new.columns else pd.Series(float('nan'), index=common)
+        repriced |= ~((o == n) | (o.isna() & n.isna()))
+    repriced = common[repriced.values]
+
+    cols = KEY_COLS + [c for c in key_cols+list(display_cols) if c not in KEY_COLS] + SPEC_COLS
+    def changes(keys, kind):
+        # Specs come from the newest table the instance is in
+        out = (old if kind == 'removed' else new).reindex(keys).filter(cols)
+        out.insert(out.columns.get_loc('Region')+1 if 'Region' in out.columns else 2, 'Change', kind)
+        for c in prices:
+            out['Old '+c] = old[c].reindex(keys) if kind != 'added' and c in old.columns else float('nan')
+            out['New '+c] = new[c].reindex(keys) if kind != 'removed' and c in new.columns else float('nan')
+        return out
+
+    return pd.concat([changes(added, 'added'), changes(removed, 'removed'),
+                      changes(repriced, 'repriced')], sort=False).reset_index(drop=True)
+
+
+def filter_diff(diff, cpus, ram, gpus=0, gpuram=10, include_unk_price=False, spot=False):
+    """Keep only the changes to instances that satisfy the requested compute
+    and whose on-demand (or spot) price changed.
+    """
+    price_name = 'Spot ($/hr)' if spot else 'Price ($/hr)'
+    if 'New '+price_name not in diff.columns:
+        return diff[:0]
+
+    old, new = diff['Old '+price_name], diff['New '+price_name]
+    df = diff[~((old == new) | (old.isna() & new.isna()))]
+    if not include_unk_price:
+        old, new = df['Old '+price_name], df['New '+price_name]
+        df = df[(old.notna() & (old != 0)) | (new.notna() & (new != 0))]
+
+    df = df[(df['CPUs'] >= cpus) & (df['RAM (GB)'] >= ram)]
+    if gpus > 0:
+        df = df[(df['GPUs'] >= gpus) & (df['GPU RAM (GB)'] >= gpuram)]
+    return df
@@ -15,6 +15,7 @@ class GCPProcessor(FixedInstance):
     """
     url ='https://cloud.google.com/compute/all-pricing'
     gpu_instances = ['n1']
+    key_cols = ['Name', 'Region', 'GPU Name', 'GPUs']
     gcloud_region_shortcodes = {
         'us-central1': 'io','us-west1': 'ore','us-west2': 'la',
         'us-west3': 'slc','us-west4': 'lv','us-east4': 'nv',
@@ -29,8 +30,8 @@ class GCPProcessor(FixedInstance):
         'asia-northeast2': 'osa','asia-northeast3': 'kr'
     }
 
-    def __init__(self, table_name='gcp_data.pkl'):
-        super().__init__(table_name)
+    def __init__(self, table_name='gcp_data.pkl', refresh_stale=True):
+        super().__init__(table_name, refresh_stale)
 
     def combine_custom_df(self, df):
         "Clean and rename custom dfs"
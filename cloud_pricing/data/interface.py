@@ -7,22 +7,49 @@ import os, re
 import datetime, time
 from pathlib import Path
 
+from cloud_pricing.data.diff import keyed_table
+
 
 class DataProcessor:
     "Process and store a table of data for a particular provider."
-    def __init__(self, table_name):
+    # Columns that identify a row of the table, used to compare versions of it
+    key_cols = ['Name', 'Region']
+    # Extra columns that tell apart rows of the same instance in a comparison
+    display_cols = []
+
+    def __init__(self, table_name, refresh_stale=True):
         data_path = Path.home()/'.cloud-pricing-data'
         data_path.mkdir(exist_ok=True)
         self.float_re = re.compile(r'\d+\.\d+')
         self.int_re = re.compile(r'\d+')
         self.table_name = data_path/table_name
-        if not self.has_setup:
+        if not os.path.exists(self.table_name) or (refresh_stale and not self.has_setup):
             self.setup()
         self.table = pd.read_pickle(self.table_name)
 
     def setup(self):
         raise NotImplementedError
 
+    def refresh(self):
+        """Download the latest data and reload the table. If the download
+        fails or the new table has repeated keys, the previous table is
+        restored and the error is raised.
+        """
+        backup = self.table_name.with_suffix('.old')
+        if os.path.exists(self.table_name):
+            os.replace(self.table_name, backup)
+        try:
+            self.setup()
+            table = pd.read_pickle(self.table_name)
+            keyed_table(table, type(self).__name__, self.key_cols)
+        except Exception:
+            if os.path.exists(backup):
+                os.replace(backup, self.table_name)
+            raise
+        if os.path.exists(backup):
+            os.remove(backup)
+        self.table = table
+
     @property
     def has_setup(self):
         if not os.path.exists(self.table_name): return False
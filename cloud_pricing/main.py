@@ -1,11 +1,45 @@
 "Main CLI"
 
 import argparse
+import json
+import time
+from pathlib import Path
 
 from cloud_pricing.data.core import CloudProcessor
+from cloud_pricing.data.diff import filter_diff
 
-def main():
+QUERY_ARGS = ['cpus', 'gpus', 'ram', 'gpuram', 'spot', 'unk_price', 'providers']
+QUERIES_PATH = Path.home()/'.cloud-pricing-data'/'queries.json'
+
+def load_queries():
+    if not QUERIES_PATH.exists(): return {}
+    with open(QUERIES_PATH, 'r') as f:
+        return json.load(f)
+
+def save_query(name, args):
+    "Store the compute constraints in `args` under `name`."
+    queries = load_queries()
+    queries[name] = {k: getattr(args, k) for k in QUERY_ARGS}
+    QUERIES_PATH.parent.mkdir(exist_ok=True)
+    with open(QUERIES_PATH, 'w') as f:
+        json.dump(queries, f, indent=2)
+
+def watch(proc, args):
+    "Refresh the prices every `args.interval` hours and print the changes matching the query."
+    while True:
+        try:
+            diff = filter_diff(proc.update(), args.cpus, args.ram, args.gpus, args.gpuram, args.unk_price, args.spot)
+            print(time.strftime('%Y-%m-%d %H:%M:%S'), f'{len(diff)} matching price changes')
+            if len(diff) > 0:
+                print(diff)
+        except Exception as e:
+            print(time.strftime('%Y-%m-%d %H:%M:%S'), f'Failed to refresh prices: {e}')
+        time.sleep(args.interval*3600)
+
+def get_parser():
     parser = argparse.ArgumentParser(description="Compare cloud pricing on the command line. Set the required compute and receive a table of compatible prices. For some services (like AWS) the instance type reflects the best fit given the input constraints.")
+    parser.add_argument("mode", nargs='?', default='query', choices=['query', 'watch'],
+        help="'query' shows the current prices. 'watch' refreshes the prices on a schedule and shows the changes matching the query.")
     parser.add_argument("--cpus", "-c", default=4, type=int,
         help="Number of CPUs to request.")
     parser.add_argument("--gpus", "-g", default=0, type=int,
@@ -20,22 +54,59 @@ def main():
         help="The number of results to show.")
     parser.add_argument("--unk_price", "-P", default=False, action='store_true',
         help="Exclude products that don't have a known price.")
+    parser.add_argument("--no-unk_price", dest='unk_price', action='store_false',
+        help="Undo --unk_price, overriding a saved query.")
     parser.add_argument("--out", "-o", default=None, type=str,
         help="Save the outputs to a file. {csv | json}")
     parser.add_argument("--spot", "-s", default=False, action='store_true',
         help="Use spot (preemptible) prices.")
+    parser.add_argument("--no-spot", dest='spot', action='store_false',
+        help="Use on-demand prices, overriding a saved query.")
     parser.add_argument("--update", "-U", default=False, action='store_true',
         help="Force an update to the database of prices.")
     parser.add_argument("--providers", default='ALL',
         help=("List of providers to search over. Comma separated string "
               "of 'AWS', 'Azure', 'GCP', or 'All'. Example: 'aws,gcp' "))
+    parser.add_argument("--save-query", default=None, type=str,
+        help=("Save the compute constraints of this query under a name. "
+              "Combined with --query, saves the loaded query with any flags given overriding it."))
+    parser.add_argument("--query", "-q", default=None, type=str,
+        help="Load the compute constraints from a saved query. Flags given explicitly take precedence.")
+    parser.add_argument("--interval", default=24., type=float,
+        help="Hours between refreshes in watch mode.")
+    return parser
+
+def parse_args(argv=None):
+    "Parse the command line, filling in any flags not given from the saved query."
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.query is not None:
+        queries = load_queries()
+        if args.query not in queries:
+            parser.error(f"Unknown query '{args.query}'. Saved queries: {', '.join(queries) or 'none'}")
+        # Reparse with the saved query as the defaults so explicit flags win
+        parser.set_defaults(**queries[args.query])
+        args = parser.parse_args(argv)
+    return args
+
+def main():
+    args = parse_args()
+    if args.save_query is not None:
+        save_query(args.save_query, args)
 
-    args = parser.parse_args()
     print(args)
-    proc = CloudProcessor(args.providers.upper())
+    # Keep stale tables when updating so they can be compared with the new ones
+    proc = CloudProcessor(args.providers.upper(), refresh_stale=not (args.update or args.mode == 'watch'))
+
+    if args.mode == 'watch':
+        watch(proc, args)
+        return
 
     if args.update:
-        proc.update()
+        diff = proc.update()
+        print(f"{len(diff)} price changes since the last update")
+        if len(diff) > 0:
+            print(diff)
 
     data = proc.filter(args.cpus, args.ram, args.gpus, args.gpuram, args.n, args.verbose, args.unk_price, args.spot)
 
@@ -0,0 +1,67 @@
+import os, time
+import pandas as pd
+import pytest
+
+from cloud_pricing.data import core
+from cloud_pricing.data.interface import FixedInstance
+
+OLD = pd.DataFrame({'Name': ['a', 'b'], 'Region': 'r', 'CPUs': 4, 'RAM (GB)': 8, 'Price ($/hr)': [1., 2.]})
+NEW = pd.DataFrame({'Name': ['a', 'b'], 'Region': 'r', 'CPUs': 4, 'RAM (GB)': 8, 'Price ($/hr)': [1., 3.]})
+REPEATED = pd.DataFrame({'Name': ['a', 'a'], 'Region': 'r', 'CPUs': 4, 'RAM (GB)': 8, 'Price ($/hr)': [1., 3.]})
+
+
+def processor(table_name, new):
+    class Processor(FixedInstance):
+        "Writes `new` whenever it downloads data."
+        def __init__(self, refresh_stale=True):
+            super().__init__(table_name, refresh_stale)
+
+        def setup(self):
+            if isinstance(new, Exception): raise new
+            new.to_pickle(self.table_name)
+    return Processor
+
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    path = tmp_path/'.cloud-pricing-data'
+    path.mkdir()
+    return path
+
+
+def stale_pickle(path, table):
+    table.to_pickle(path)
+    week_ago = time.time() - 8*24*3600
+    os.utime(path, (week_ago, week_ago))
+
+
+def test_update_compares_stale_table(data_path, monkeypatch):
+    stale_pickle(data_path/'a.pkl', OLD)
+    monkeypatch.setattr(core, 'PROVIDERS', {'A': processor('a.pkl', NEW)})
+
+    diff = core.CloudProcessor('A', refresh_stale=False).update()
+    assert list(zip(diff['Name'], diff['Change'], diff['New Price ($/hr)'])) == [('b', 'repriced', 3.)]
+
+
+def test_stale_table_is_refreshed_by_default(data_path, monkeypatch):
+    stale_pickle(data_path/'a.pkl', OLD)
+    monkeypatch.setattr(core, 'PROVIDERS', {'A': processor('a.pkl', NEW)})
+    proc = core.CloudProcessor('A')
+    assert proc._tables[0].table['Price ($/hr)'].tolist() == [1., 3.]
+
+
+@pytest.mark.parametrize('failure', [REPEATED, IOError('no connection')])
+def test_failed_refresh_keeps_previous_table(data_path, monkeypatch, failure):
+    OLD.to_pickle(data_path/'a.pkl')
+    OLD.to_pickle(data_path/'b.pkl')
+    monkeypatch.setattr(core, 'PROVIDERS', {'A': processor('a.pkl', failure), 'B': processor('b.pkl', NEW)})
+
+    proc = core.CloudProcessor('A,B', refresh_stale=False)
+    diff = proc.update()
+
+    # The other provider is still refreshed and compared
+    assert list(zip(diff['Provider'], diff['Name'])) == [('B', 'b')]
+    pd.testing.assert_frame_equal(pd.read_pickle(data_path/'a.pkl'), OLD)
+    pd.testing.assert_frame_equal(proc._tables[0].table, OLD)
+    assert not (data_path/'a.old').exists()
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from cloud_pricing.data.diff import diff_tables, filter_diff
+
+NAN = float('nan')
+GCP_KEYS = ['Name', 'Region', 'GPU Name', 'GPUs']
+
+
+def changes(diff):
+    return {(n, c) for n,c in zip(diff['Name'], diff['Change'])}
+
+
+def test_added_removed_repriced():
+    old = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Region': 'r', 'CPUs': [4, 8, 2],
+                        'RAM (GB)': [8, 16, 4], 'Price ($/hr)': [1., 2., .5]})
+    new = pd.DataFrame({'Name': ['a', 'c', 'd'], 'Region': 'r', 'CPUs': [4, 2, 16],
+                        'RAM (GB)': [8, 4, 64], 'Price ($/hr)': [1.2, .5, 3.]})
+    diff = diff_tables(old, new, 'AZURE')
+    assert changes(diff) == {('a', 'repriced'), ('b', 'removed'), ('d', 'added')}
+
+    a = diff[diff['Name'] == 'a'].iloc[0]
+    assert (a['Old Price ($/hr)'], a['New Price ($/hr)']) == (1., 1.2)
+    assert pd.isna(diff[diff['Name'] == 'b']['New Price ($/hr)']).all()
+    assert pd.isna(diff[diff['Name'] == 'd']['Old Price ($/hr)']).all()
+
+
+def test_region_is_part_of_key():
+    old = pd.DataFrame({'Name': ['a'], 'Region': ['r1'], 'Price ($/hr)': [1.]})
+    new = pd.DataFrame({'Name': ['a'], 'Region': ['r2'], 'Price ($/hr)': [1.]})
+    assert changes(diff_tables(old, new, 'AZURE')) == {('a', 'added'), ('a', 'removed')}
+
+
+def test_shared_names_aws():
+    # One row per OS for the same instance, keyed on the SKU index
+    old = pd.DataFrame({'Name': ['m5', 'm5', 'm5'], 'Region': 'ohio',
+                        'operatingSystem': ['Linux', 'Windows', 'RHEL'],
+                        'Price ($/hr)': [.096, .188, 0.]},
+                       index=pd.Index(['s1', 's2', 's3'], name='sku'))
+    new = old.copy()
+    new.loc['s1', 'Price ($/hr)'] = .2
+    diff = diff_tables(old, new, 'AWS', ['sku'], ['operatingSystem'])
+    assert list(zip(diff['sku'], diff['operatingSystem'])) == [('s1', 'Linux')]
+    assert list(diff['Change']) == ['repriced']
+
+
+def test_shared_names_gcp_gpus():
+    old = pd.DataFrame({'Name': ['n1 with GPU']*3, 'Region': 'us-east1',
+                        'GPU Name': ['T4', 'T4', 'V100'], 'GPUs': [1, 4, 1],
+                        'CPUs': 4, 'RAM (GB)': 15, 'GPU RAM (GB)': [16, 64, 16],
+                        'Price ($/hr)': [1., 4., 2.5]})
+    new = old.copy()
+    new.loc[1, 'Price ($/hr)'] = 8.
+    diff = diff_tables(old, new, 'GCP', GCP_KEYS)
+    assert list(zip(diff['GPU Name'], diff['GPUs'], diff['Change'])) == [('T4', 4, 'repriced')]
+    assert len(filter_diff(diff, 4, 8, gpus=4, gpuram=32)) == 1
+
+
+def test_repeated_key_raises():
+    df = pd.DataFrame({'Name': ['a', 'a'], 'Region': 'r', 'Price ($/hr)': [1., 2.]})
+    with pytest.raises(ValueError):
+        diff_tables(df, df, 'AZURE')
+
+
+def test_exact_copies_are_ignored():
+    df = pd.DataFrame({'Name': ['a', 'a'], 'Region': 'r', 'Price ($/hr)': [1., 1.]})
+    assert len(diff_tables(df, df, 'AZURE')) == 0
+
+
+def test_nan_prices():
+    old = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Region': 'r',
+                        'Price ($/hr)': [NAN, NAN, 1.], 'Spot ($/hr)': [NAN, .5, NAN]})
+    new = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Region': 'r',
+                        'Price ($/hr)': [NAN, 2., 1.], 'Spot ($/hr)': [NAN, .5, .3]})
+    assert changes(diff_tables(old, new, 'AZURE')) == {('b', 'repriced'), ('c', 'repriced')}
+
+
+def test_empty_tables():
+    empty = pd.DataFrame({'Name': [], 'Region': [], 'Price ($/hr)': []})
+    full = pd.DataFrame({'Name': ['a'], 'Region': ['r'], 'Price ($/hr)': [1.]})
+    assert len(diff_tables(empty, empty, 'AZURE')) == 0
+    assert changes(diff_tables(empty, full, 'AZURE')) == {('a', 'added')}
+    assert changes(diff_tables(full, empty, 'AZURE')) == {('a', 'removed')}
+
+
+def test_filter_diff_spot_and_unknown_prices():
+    old = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Region': 'r', 'CPUs': 8, 'RAM (GB)': 32,
+                        'Price ($/hr)': [1., 2., 3.], 'Spot ($/hr)': [.3, 0., .9]})
+    new = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Region': 'r', 'CPUs': 8, 'RAM (GB)': 32,
+                        'Price ($/hr)': [1.5, 2., 3.], 'Spot ($/hr)': [.3, NAN, .8]})
+    diff = diff_tables(old, new, 'AZURE')
+
+    assert set(filter_diff(diff, 4, 8)['Name']) == {'a'}
+    assert set(filter_diff(diff, 4, 8, spot=True)['Name']) == {'c'}
+    assert set(filter_diff(diff, 4, 8, include_unk_price=True, spot=True)['Name']) == {'b', 'c'}
+    assert len(filter_diff(diff, 16, 8)) == 0
+
+
+def test_filter_diff_missing_spot_column():
+    old = pd.DataFrame({'Name': ['a'], 'Region': 'r', 'CPUs': 8, 'RAM (GB)': 32, 'Price ($/hr)': [1.]})
+    new = old.assign(**{'Price ($/hr)': [2.]})
+    assert len(filter_diff(diff_tables(old, new, 'AWS'), 4, 8, spot=True)) == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from cloud_pricing import main
+
+
+@pytest.fixture
+def saved(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'QUERIES_PATH', tmp_path/'queries.json')
+    main.save_query('train', main.parse_args(['--cpus', '8', '--gpus', '1', '--spot', '--providers', 'gcp']))
+
+
+def test_saved_query_is_loaded(saved):
+    args = main.parse_args(['watch', '--query', 'train'])
+    assert (args.mode, args.cpus, args.gpus, args.spot, args.providers) == ('watch', 8, 1, True, 'gcp')
+
+
+def test_explicit_flags_override_saved_query(saved):
+    # Explicit values equal to the argparse defaults still win
+    args = main.parse_args(['--query', 'train', '--cpus', '4', '--no-spot'])
+    assert (args.cpus, args.gpus, args.spot) == (4, 1, False)
+
+
+def test_save_loaded_query_with_overrides(saved):
+    main.save_query('big', main.parse_args(['--query', 'train', '--ram', '64']))
+    big = main.load_queries()['big']
+    assert (big['cpus'], big['ram'], big['spot']) == (8, 64, True)
+
+
+def test_unknown_query(saved):
+    with pytest.raises(SystemExit):
+        main.parse_args(['--query', 'missing'])